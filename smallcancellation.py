@@ -1,10 +1,9 @@
 import grouptheory.freegroups as fg
 import grouptheory.freegroups.whiteheadgraph as wg
 from collections import deque
+import concurrent.futures
 from fractions import Fraction
-import itertools
-import networkx as nx
-import math
+import functools
 
 def smallcancellation(relatorlist,theCprimebound=None):
     """
@@ -26,19 +25,18 @@ def smallcancellation(relatorlist,theCprimebound=None):
     F,rels=fg.parseinputwords(relatorlist)
     if not all(r==F.cyclic_reduce(r) for r in rels):
         raise ValueError("Relators are not cyclically reduced.")
+    key=_relatorkey(rels)
     if theCprimebound is None:
-        theCprimebound=Cprimebound(rels)
+        theCprimebound=_Cprimebound(key)
     if theCprimebound<Fraction(1,6):
         return True
-    theT=T(rels)
-    Cest=int(math.ceil(Fraction(theCprimebound.denominator,theCprimebound.numerator))) #C'(1/L) => C(L+1), quick check without computing C value
-    if (Cest>=5 and theT>=4) or (Cest>=4 and theT>=5) or (Cest>=3 and theT>=7):
+    theT=_T(rels)
+    neededC=7 if theT<4 else 5 if theT<5 else 4 if theT<7 else 3 # C7, C5-T4, C4-T5 and C3-T7 each suffice, so given theT this is the smallest C value that does
+    Cest=-(-theCprimebound.denominator//theCprimebound.numerator) #C'(1/L) => C(L+1), quick check without computing C value. Integer ceiling of denominator/numerator.
+    if Cest>=neededC:
         return True
-    theC=C(rels,7) # sometimes the C value is better than the estimate given by the C' value, compute it for real
-    if (theC>=7) or (theC>=5 and theT>=4) or (theC>=4 and theT>=5) or (theC>=3 and theT>=7):
-        return True
-    else:
-        return False
+    theC=_C(key,neededC) # sometimes the C value is better than the estimate given by the C' value, compute it for real, but only as far as needed
+    return theC>=neededC
 
 def Cprimebound(relatorlist,Lambda=1):
     """
@@ -49,29 +47,147 @@ def Cprimebound(relatorlist,Lambda=1):
     F,rels=fg.parseinputwords(relatorlist)
     if not all(r==F.cyclic_reduce(r) for r in rels):
         raise ValueError("Relators are not cyclically reduced.")
-    biggestratio=Fraction(1,min(len(r) for r in rels))
-    if biggestratio>=Fraction(1,Lambda):
-        return 1
-    rels.sort(key=len) # sort list of relators with shortest first
-    irels=[rel for rel in itertools.chain.from_iterable(zip([w() for w in rels],[(w**(-1))() for w in rels]))] # arrange relators and inverses in a list of the form relator1, inverse of relator1, relator2, inverse of relator2,...
+    return _Cprimebound(_relatorkey(rels),Lambda)
+
+def _relatorkey(rels):
+    """
+    A canonical hashable key for the cyclically reduced words rels, on which the results of the computations of pieces are cached.
+
+    It is the tuple of pairs (relator, inverse of relator) as bytes, so that comparisons are plain memory comparisons, sorted by length of relator, shortest first, and then lexicographically.
+    """
+    return tuple(sorted(((w().encode('ascii'),(w**(-1))().encode('ascii')) for w in rels),key=lambda pair:(len(pair[0]),pair[0])))
+
+@functools.lru_cache(maxsize=32) # entries are about as large as the relators
+def _relatordata(key):
+    """
+    Compute the data about the relators with the given _relatorkey that is shared by _Cprimebound and _pieces.
+
+    Returns irels, the list relator1, inverse of relator1, relator2, inverse of relator2,... in the order of key, drels, the list of doubled irels, and longest, the output of _longestpiecetable, giving the length of the longest piece starting at each index of each of irels.
+    """
+    if not key: # no relators, no pieces
+        return [],[],[]
+    irels=[rel for pair in key for rel in pair] # arrange relators and inverses in a list of the form relator1, inverse of relator1, relator2, inverse of relator2,...
     drels=[x+x for x in irels] # double the relators to look for pieces that would have wrapped
-    for relatorindex in range(len(rels)):
+    positions,commonprefixlengths=_sortedsuffixes(drels,len(irels[-1])) # a piece is no longer than the longest relator
+    return irels,drels,_longestpiecetable(irels,positions,commonprefixlengths)
+
+@functools.lru_cache(maxsize=1024)
+def _Cprimebound(key,Lambda=1):
+    """
+    Cprimebound for the relators with the given _relatorkey.
+    """
+    bn,bd=1,len(key[0][0]) # biggest ratio bn/bd found so far, kept as a pair of ints to avoid Fraction arithmetic
+    if bn*Lambda>=bd: # check this before doing any real work
+        return 1
+    irels,drels,longest=_relatordata(key)
+    # longest already gives the longest piece of every relator, so there is no per-relator scan left to skip by bounding it first
+    for relatorindex in range(len(irels)//2):
         relator=irels[2*relatorindex]
-        foundbiggest=False
-        for L in range(len(relator),int(biggestratio*len(relator)),-1):# only check subwords of length L that would give biggest ratio if they were a piece
-            for startingindex in range(len(relator)):
-                p=(relator+relator)[startingindex:startingindex+L] # the subword of length L starting at index i in relator as a cyclic word
-                # now we need to check if p is a piece
-                # we do not need to check lower relatorindices, because we already scanned those relators for pieces
-                if any(p in x for x in [(relator+relator)[startingindex+1:len(relator)+startingindex+L-1]]+[drels[i] for i in range(2*relatorindex+1,len(drels))]):# look in this (doubled) relator at higher starting indices, and in all later relators, for other copies of p. If found a matching subword, p is a piece.
-                    biggestratio=Fraction(len(p),len(relator))
-                    foundbiggest=True # we search pieces by decreasing length, so first one we find is longest
-                    if biggestratio>=Fraction(1,Lambda):
-                        return 1
-                    break
-            if foundbiggest: # if we found the biggest piece in this relator we can move on to the next relator. 
-                break
-    return biggestratio
+        longestpiece=max(longest[2*relatorindex])
+        if longestpiece*bd>bn*len(relator):
+            bn,bd=longestpiece,len(relator)
+            if bn*Lambda>=bd:
+                return 1
+    return Fraction(bn,bd)
+
+def _sortedsuffixes(drels,maxlength,blocklength=32):
+    """
+    Sort the suffixes, truncated to maxlength, of the strings in drels that start in the first half of their string.
+
+    Return a list of pairs (i,j), representing the suffix drels[i][j:] with j<len(drels[i])//2, in lexicographic order, and a list whose k-th entry is the length of the common prefix of the (k-1)-st and k-th suffixes in that order, or some number at least maxlength if that is longer.
+    A suffix starting in the second half of drels[i]=x+x is a prefix of the one starting len(x) earlier, so it is not needed.
+
+    Suffixes are sorted by their prefixes of length blocklength and then, if maxlength is longer, by prefix doubling on integer ranks, so memory use is proportional to blocklength rather than maxlength times the total length of drels.
+    The two ways of sorting give the same longest pieces:
+
+    >>> irels=[b'aaBBaB',b'bAbbAA',b'aabAbaBB',b'bbAbaBAA']
+    >>> drels=[x+x for x in irels]
+    >>> _longestpiecetable(irels,*_sortedsuffixes(drels,8,blocklength=1))
+    [[2, 4, 3, 2, 2, 3], [3, 4, 3, 2, 3, 2], [2, 1, 5, 4, 3, 4, 3, 3], [3, 5, 4, 3, 2, 1, 3, 4]]
+    >>> _longestpiecetable(irels,*_sortedsuffixes(drels,8,blocklength=1))==_longestpiecetable(irels,*_sortedsuffixes(drels,8))
+    True
+    """
+    if maxlength<=blocklength: # sorting the truncated suffixes themselves is cheap enough
+        suffixes=sorted((drels[i][j:j+maxlength],i,j) for i in range(len(drels)) for j in range(len(drels[i])//2))
+        positions=[(i,j) for s,i,j in suffixes]
+        commonprefixlengths=[0]+[_commonprefixlength(s,t) for (s,i,j),(t,k,l) in zip(suffixes,suffixes[1:])]
+        return positions,commonprefixlengths
+    # Prefix doubling needs the ranks of suffixes starting at every index g of the strings in drels, listed in allpositions.
+    # ranks at level L are the ranks of the prefixes of length L of the suffixes; equal ranks mean equal prefixes, provided both suffixes have at least L letters remaining.
+    allpositions=[(i,j) for i in range(len(drels)) for j in range(len(drels[i]))]
+    remaining=[len(drels[i])-j for i,j in allpositions]
+    levels=[(blocklength,_ranks([drels[i][j:j+blocklength] for i,j in allpositions]))]
+    while levels[-1][0]<maxlength:
+        L,ranks=levels[-1]
+        levels.append((2*L,_ranks([(ranks[g],ranks[g+L] if remaining[g]>L else -1) for g in range(len(allpositions))]))) # the prefix of length 2L is the prefix of length L followed by the prefix of length L of the suffix L letters later
+    ranks=levels[-1][1]
+    order=sorted((g for g,(i,j) in enumerate(allpositions) if j<len(drels[i])//2),key=ranks.__getitem__)
+    def commonprefixlength(g,h):
+        # greedily match blocks of decreasing length using the ranks, then compare the remaining part of a block directly
+        n=0
+        for L,ranks in reversed(levels):
+            if remaining[g]-n>=L and remaining[h]-n>=L and ranks[g+n]==ranks[h+n]:
+                n+=L
+        (i,j),(k,l)=allpositions[g],allpositions[h]
+        return n+_commonprefixlength(drels[i][j+n:j+n+blocklength],drels[k][l+n:l+n+blocklength])
+    positions=[allpositions[g] for g in order]
+    commonprefixlengths=[0]+[commonprefixlength(g,h) for g,h in zip(order,order[1:])]
+    return positions,commonprefixlengths
+
+def _ranks(keys):
+    """
+    Return a list of ranks of keys, so that keys[g]<keys[h] if and only if ranks[g]<ranks[h], and equal keys have equal ranks.
+    """
+    order=sorted(range(len(keys)),key=keys.__getitem__)
+    ranks=[0]*len(keys)
+    rank=0
+    for previous,g in zip(order,order[1:]):
+        if keys[g]!=keys[previous]:
+            rank+=1
+        ranks[g]=rank
+    return ranks
+
+def _commonprefixlength(s,t):
+    """
+    The length of the longest common prefix of s and t.
+    """
+    # Compare whole prefixes, which is done by memory comparison, rather than letter by letter in Python.
+    # Double the length until the prefixes differ, then binary search between the last two lengths.
+    shorter=min(len(s),len(t))
+    lo,hi=0,1
+    while hi<=shorter and s[:hi]==t[:hi]:
+        lo,hi=hi,2*hi
+    hi=min(hi,shorter+1) # s[:lo]==t[:lo] and s[:hi]!=t[:hi], or hi exceeds both lengths
+    while hi-lo>1:
+        mid=(lo+hi)//2
+        if s[lo:mid]==t[lo:mid]:
+            lo=mid
+        else:
+            hi=mid
+    return lo
+
+def _longestpiecetable(irels,positions,commonprefixlengths):
+    """
+    Return a list whose i-th entry is a list whose s-th entry is the length of the longest piece that is a subword of the cyclic word irels[i] starting at index s.
+
+    positions,commonprefixlengths should be the output of _sortedsuffixes for the doubled irels.
+    """
+    longest=[[0]*len(x) for x in irels]
+    # Another copy of a piece starting at index j of irels[i] is a prefix of some other suffix in positions, and the piece is no longer than the relators of either suffix.
+    # So we want the maximum, over the other suffixes, of the minimum of the common prefix length and the length of their relator.
+    # The common prefix length with a suffix further away in sorted order is the minimum of the commonprefixlengths in between, and min distributes over max, so one running value in each direction suffices.
+    best=0
+    for (i,j),c in zip(positions,commonprefixlengths):
+        best=min(best,c)
+        longest[i][j]=min(best,len(irels[i]))
+        best=max(best,len(irels[i]))
+    best=0
+    for k in range(len(positions)-1,-1,-1):
+        i,j=positions[k]
+        longest[i][j]=max(longest[i][j],min(best,len(irels[i])))
+        best=max(best,len(irels[i]))
+        best=min(best,commonprefixlengths[k])
+    return longest
 
 def T(relatorlist):
     """
@@ -81,92 +197,178 @@ def T(relatorlist):
     F,rels=fg.parseinputwords(relatorlist)
     if not all(r==F.cyclic_reduce(r) for r in rels):
         raise ValueError("Relators are not cyclically reduced.")
-    G=nx.Graph(wg.WGraph(rels)) # compute the whitehead graph and then reduce it (to a simple Graph)
-    theedges=[e for e in G.edges()]
+    return _T(rels)
+
+def _T(rels):
+    """
+    T for cyclically reduced words rels.
+    """
+    Wg=wg.WGraph(rels) # compute the whitehead graph
+    # reduce it to a simple graph on vertices 0,1,... and put the adjacency in compressed form: the neighbors of vertex u are neighbors[firstneighbor[u]:firstneighbor[u+1]]
+    vertexindex={v:i for i,v in enumerate(Wg.nodes())}
+    adjacent=[set() for v in vertexindex]
+    for v,w in Wg.edges():
+        adjacent[vertexindex[v]].add(vertexindex[w])
+        adjacent[vertexindex[w]].add(vertexindex[v])
+    firstneighbor=[0]
+    neighbors=[]
+    for vertexneighbors in adjacent:
+        neighbors.extend(vertexneighbors)
+        firstneighbor.append(len(neighbors))
     shortestcycle=float('inf')
-    for e in theedges:
-        G.remove_edge(*e)
-        try:
-            shortestcycleusing_e=1+nx.shortest_path_length(G,*e) # compute distance between endpoints of e in G-e then add 1
-        except nx.NetworkXNoPath:
-            shortestcycleusing_e=float('inf')
-        G.add_edge(*e)
-        shortestcycle=min(shortestcycle,shortestcycleusing_e)
+    for source in range(len(vertexindex)): # breadth first search from each vertex; every shortest cycle is found from its own vertices
+        depth=[-1]*len(vertexindex)
+        parent=[-1]*len(vertexindex)
+        depth[source]=0
+        queue=deque([source])
+        while queue:
+            u=queue.popleft()
+            if 2*depth[u]+1>=shortestcycle: # any cycle found from here on is at least this long
+                break
+            for v in neighbors[firstneighbor[u]:firstneighbor[u+1]]:
+                if depth[v]==-1:
+                    depth[v]=depth[u]+1
+                    parent[v]=u
+                    queue.append(v)
+                elif v!=parent[u]: # non-tree edge closes up a cycle through at most this many edges
+                    shortestcycle=min(shortestcycle,depth[u]+depth[v]+1)
     return shortestcycle
 
 
     
-def C(relatorlist,quit_at=float('inf')):
+def C(relatorlist,quit_at=float('inf'),processes=1):
     """
     FInd the minimum number p such that there exists some cyclic permutation of some relator that can be expressed as a freely reduced product of p pieces.
 
     If quit_at=q is specified the algorithm will stop and return q once it is determined that p>=q.
+
+    If processes>1 the relators are split between that many worker processes. This only pays off when there are several long relators.
+
+    >>> C([[1,2,-1,-2],[3,4,-3,-4]])
+    4
+    >>> C([[1,2,-1,-2],[3,4,-3,-4]],processes=2)
+    4
+    >>> C([],5)
+    5
     """
     F,rels=fg.parseinputwords(relatorlist)
     if not all(r==F.cyclic_reduce(r) for r in rels):
         raise ValueError("Relators are not cyclically reduced.")
-    thepieces=pieces(rels)
+    key=_relatorkey(rels)
+    if min(processes,len(key))>1:
+        return _parallelC(key,quit_at,processes)
+    return _C(key,quit_at)
+
+@functools.lru_cache(maxsize=1024)
+def _C(key,quit_at=float('inf')):
+    """
+    C for the relators with the given _relatorkey.
+    """
+    relators=[r for r,rinverse in key]
+    thepieces=[q for p in _pieces(key) for q in (p,p.swapcase()[::-1])] # both orientations of each piece
+    return _min_piece_expression(relators,thepieces,quit_at)
+
+def _parallelC(key,quit_at,processes):
+    """
+    C for the relators with the given _relatorkey, with the relators split between processes worker processes.
+    """
+    relators=[r for r,rinverse in key]
+    thepieces=[q for p in _pieces(key) for q in (p,p.swapcase()[::-1])] # both orientations of each piece
+    processes=min(processes,len(relators))
+    # relators are handled independently, so give each worker process a share of them and take the minimum of their answers
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        return min(executor.map(_min_piece_expression,[relators[k::processes] for k in range(processes)],[thepieces]*processes,[quit_at]*processes))
+
+def _min_piece_expression(relators,thepieces,quit_at):
+    """
+    The minimum over relators, given as bytes, of the minimal number of elements of thepieces whose concatenation is a cyclic permutation of the relator, or quit_at if that is smaller.
+    """
     minnumberpieces=quit_at
-    def min_string_piece_expression(whatsleft,thepieces,quit_at):
-        # recursively determine the minimal expression of the string whatsleft as a concatenation of elements of thepieces, or stop once it is determined that any such expression requires at least quit_at many pieces
-        # find a piece that agrees with a prefix of whatsleft and the recurse on the suffix
-        if not whatsleft:
-            return 0
-        minexp=quit_at
-        for p in thepieces:
-            if p!=whatsleft[:len(p)]:
-                continue
-            else:
-                minexp=min(minexp,1+min_string_piece_expression(whatsleft[len(p):],thepieces,minexp-1))
+    piecetrie=_piecetrie(thepieces) # the pieces that are prefixes of a word are found by walking the word down the trie
+    def min_string_piece_expressions(word,start,end,quit_at):
+        # determine, for each start<=j<=end, the minimal expression of the string word[j:end] as a concatenation of elements of thepieces, or quit_at if any such expression requires at least quit_at many pieces
+        # dynamic programming from the end of the word backwards: an expression of word[j:end] is a piece that agrees with a prefix of it followed by an expression of the remaining suffix
+        minexp=[quit_at]*(end-start+1) # minexp[j-start] is the answer for word[j:end]
+        minexp[end-start]=0
+        for j in range(end-1,start-1,-1):
+            node=piecetrie
+            for i in range(j,end):
+                if word[i] not in node:
+                    break
+                node=node[word[i]]
+                if '$' in node: # word[j:i+1] is a piece
+                    minexp[j-start]=min(minexp[j-start],1+minexp[i+1-start])
         return minexp
-    def min_relator_piece_expression(relator,thepieces,quit_at):
-        # This is first step in recursive search. Here we want to  find a piece p such that for relator r we can write p=xy and r=yzx, with y nontrivial. That is, in this step only we think of r as cyclic word and allow first piece that wraps.
-        r=relator()
+    def min_relator_piece_expression(r,quit_at):
+        # This is first step in the search. Here we want to  find a piece p such that for relator r we can write p=xy and r=yzx, with y nontrivial. That is, in this step only we think of r as cyclic word and allow first piece that wraps.
+        rr=r+r # build the doubled relator once, rather than for every candidate
         minexp=quit_at
-        for p in thepieces:
-            if len(p)>len(r):
-                continue
-            possiblestartingindices=[] # for given p there may be different possible choices of y
-            for startingindex in range(len(r)-len(p)+1,len(r)+1):
-                if p==(r+r)[startingindex:startingindex+len(p)]:
-                    possiblestartingindices.append(startingindex)
-            if not possiblestartingindices:
-                continue
-            for startingindex in possiblestartingindices:
-                # found a way to fit p into r spanning the beginning of r. This accounts for x and y part of r. Now recursively find shortest expression of z=whatsleft as a concatenation of pieces.
-                whatsleft=(r+r)[startingindex+len(p):startingindex+len(r)]
-                if not whatsleft:
-                    return 1
-                else:
-                    minexp=min(minexp,1+min_string_piece_expression(whatsleft,thepieces,minexp-1))
+        firstpieces=dict() # startingindex -> lengths of pieces p that fit into r starting at startingindex and spanning the beginning of r
+        # Instead of searching rr for each piece separately, sweep once over the possible starting indices and walk down the trie from each, which finds exactly the pieces that occur there. The walk stops at the first letter of rr that no piece continues with, so screening pieces by the letters of r first would not save anything.
+        for startingindex in range(1,len(r)+1):
+            node=piecetrie
+            for i in range(startingindex,startingindex+len(r)):
+                if rr[i] not in node:
+                    break
+                node=node[rr[i]]
+                if '$' in node and i>=len(r): # p=rr[startingindex:i+1] is a piece that reaches the beginning of r; for given p there may be different possible choices of y
+                    firstpieces.setdefault(startingindex,[]).append(i+1-startingindex)
+        for startingindex,lengths in firstpieces.items():
+            # found ways to fit p into r spanning the beginning of r. This accounts for x and y part of r. Now find shortest expression of z=whatsleft as a concatenation of pieces. All choices of p with the same starting index share the same end of whatsleft.
+            if len(r) in lengths:
+                return 1
+            expressions=min_string_piece_expressions(rr,startingindex,startingindex+len(r),minexp)
+            minexp=min([minexp]+[1+expressions[L] for L in lengths])
         return minexp
-    for thisrelator in rels:
-        minnumberpieces=min(minnumberpieces,min_relator_piece_expression(thisrelator,thepieces,minnumberpieces))
+    for thisrelator in relators:
+        minnumberpieces=min(minnumberpieces,min_relator_piece_expression(thisrelator,minnumberpieces))
     return minnumberpieces
 
+def _piecetrie(thepieces):
+    """
+    Return a trie of thepieces as nested dicts keyed by letters (ints, for pieces given as bytes), in which the node reached by the letters of a piece contains the key '$'.
+    """
+    root=dict()
+    for p in thepieces:
+        node=root
+        for letter in p:
+            node=node.setdefault(letter,dict())
+        node['$']=len(p)
+    return root
 
         
 def pieces(relatorlist):
     """
     Given input container of relators, return set of pieces, which are subwords occuring more than once in relators or their inverses, as cyclic words.
+
+    A piece is no longer than either of the relators it occurs in, so the result does not depend on the order of the relators.
+
+    >>> sorted(pieces([[-2,-2,1,1,1],[1,2,1,-2,-2,-2],[-2,-1]]))
+    ['A', 'AA', 'AB', 'Ab', 'Abb', 'B', 'BA', 'BB', 'BBa', 'Ba', 'a', 'aB', 'aBB', 'aa', 'ab', 'b', 'bA', 'ba', 'bb', 'bbA']
+    >>> pieces([[-2,-2,1,1,1],[1,2,1,-2,-2,-2],[-2,-1]])==pieces([[-2,-1],[1,2,1,-2,-2,-2],[-2,-2,1,1,1]])
+    True
+    >>> pieces([])
+    set()
     """
     F,rels=fg.parseinputwords(relatorlist)
     if not all(r==F.cyclic_reduce(r) for r in rels):
         raise ValueError("Relators are not cyclically reduced.")
+    return set(q.decode('ascii') for p in _pieces(_relatorkey(rels)) for q in (p,p.swapcase()[::-1]))
+
+@functools.lru_cache(maxsize=1024)
+def _pieces(key):
+    """
+    The frozenset of pieces, as bytes, of the relators with the given _relatorkey.
+
+    The inverse of a piece is a piece, so only the lesser of each piece and its inverse is included.
+    """
+    irels,drels,longest=_relatordata(key)
     pieces=set()
-    irels=[rel for rel in itertools.chain.from_iterable(zip([w() for w in rels],[(w**(-1))() for w in rels]))] # arrange relators and inverses in a list of the form relator1, inverse of relator1, relator2, inverse of relator2,...
-    drels=[x+x for x in irels]
-    for relatorindex in range(len(rels)): # only need to search relators for candidate pieces, since a piece contained in inverse will be inverse of piece contained in relator
-        relator=irels[2*relatorindex]
-        for L in range(1,1+len(relator)):
-            for startingindex in range(len(relator)):
-                p=(relator+relator)[startingindex:startingindex+L] # the subword of length L starting at index i in reltaor as a cyclic word
-                # now we need to check if p is a piece
-                # we do not need to check lower relatorindices, because we already scanned those relators for pieces
-                if any(p in x for x in [(relator+relator)[startingindex+1:len(relator)+startingindex+L-1]]+[drels[i] for i in range(2*relatorindex+1,len(drels))]):# found a matching subword, p is a piece
-                    pieces.add(p)
-                    pieces.add(''.join(reversed(p.swapcase())))
-    return pieces
+    for relatorindex in range(len(irels)//2): # only need to search relators for candidate pieces, since a piece contained in inverse will be inverse of piece contained in relator
+        for startingindex,L in enumerate(longest[2*relatorindex]):
+            # every prefix of a piece is a piece
+            pieces.update(min(p,p.swapcase()[::-1]) for p in (drels[2*relatorindex][startingindex:startingindex+l] for l in range(1,L+1)))
+    return frozenset(pieces)
 
 
         